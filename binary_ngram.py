@@ -17,45 +17,86 @@ Usage:
 import os
 import sys
 import argparse
-import binascii
-from collections import Counter, defaultdict
+import mmap
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Lets format_pattern show a pattern's printable bytes as text and the rest as dots
+ASCII_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+def map_binary(file_path):
+    """Map a binary file read-only instead of copying it into memory.
+    
+    The mapping stays valid after the file is closed. Empty files cannot be
+    mapped, so they come back as empty bytes.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
 def extract_ngrams_from_binary(file_path, n=8):
-    """Extract n-byte sequences from a binary file with their positions."""
+    """Extract the distinct n-byte sequences from a binary file.
+    
+    Returns the file content together with the set of raw n-byte windows.
+    Positions are only looked up later for the patterns that get displayed.
+    """
     try:
-        with open(file_path, 'rb') as f:
-            content = f.read()
+        content = map_binary(file_path)
         
-        # Dictionary to store ngrams and their positions
-        ngrams_with_positions = defaultdict(list)
+        # Slice every n-byte window with map() so the loop runs in C rather
+        # than as one Python iteration per offset
+        count = len(content) - n + 1
+        ngrams = set(map(content.__getitem__, map(slice, range(count), range(n, n + count))))
         
-        # Generate ngrams
-        for i in range(len(content) - n + 1):
-            ngram = content[i:i+n]
-            # Store as hex string for easier comparison
-            hex_ngram = binascii.hexlify(ngram).decode('ascii')
-            ngrams_with_positions[hex_ngram].append(i)
-        
-        return ngrams_with_positions
+        return content, ngrams
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
-        return {}
+        return b'', set()
 
-def byte_to_ascii(byte_val):
-    """Convert a byte to ASCII character if printable, or dot if not."""
-    if 32 <= byte_val <= 126:
-        return chr(byte_val)
-    return '.'
+def _extract_ngram_set(file_path, n):
+    """Worker for count_common_ngrams: only the n-gram set is sent back, since
+    the mapped content cannot be pickled."""
+    content, ngrams = extract_ngrams_from_binary(file_path, n)
+    if isinstance(content, mmap.mmap):
+        content.close()
+    return ngrams
 
-def format_pattern(hex_pattern):
-    """Format a hex pattern for display with hex and ASCII representation."""
-    # Split into pairs for readability
-    byte_pairs = [hex_pattern[i:i+2] for i in range(0, len(hex_pattern), 2)]
-    hex_repr = ' '.join(byte_pairs)
-    
-    # Convert to bytes then to ASCII representation
-    bytes_array = binascii.unhexlify(hex_pattern)
-    ascii_repr = ''.join(byte_to_ascii(b) for b in bytes_array)
+def _iter_ngram_sets(file_list, n):
+    """Yield the n-gram set of each file, in file order.
+    
+    With more than one file and CPU the sets are extracted in worker
+    processes, but only one task per worker is submitted ahead of the set
+    being consumed, so finished sets cannot pile up in this process.
+    """
+    workers = min(len(file_list), os.cpu_count() or 1)
+    if workers <= 1:
+        for file_path in file_list:
+            yield _extract_ngram_set(file_path, n)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for file_path in file_list:
+            if len(pending) == workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_extract_ngram_set, file_path, n))
+        while pending:
+            yield pending.popleft().result()
+
+def find_positions(content, pattern):
+    """Find all (possibly overlapping) positions of a pattern in the content."""
+    positions = []
+    pos = content.find(pattern)
+    while pos != -1:
+        positions.append(pos)
+        pos = content.find(pattern, pos + 1)
+    return positions
+
+def format_pattern(pattern):
+    """Format a raw byte pattern for display with hex and ASCII representation."""
+    hex_repr = pattern.hex(' ')
+    ascii_repr = pattern.translate(ASCII_TABLE).decode('ascii')
     
     return hex_repr, ascii_repr
 
@@ -63,32 +104,62 @@ def format_position(pos):
     """Format a position as a hexadecimal address."""
     return f"0x{pos:08x}"
 
-def analyze_files(file_list, ngram_size=8, top_count=20, min_files=2, output_file=None):
-    """Analyze a list of files for common n-grams."""
-    # Dictionary to store results for each file
-    all_files_ngrams = {}
-    ngrams_with_positions = {}
-    
-    # Process all files
-    for file_path in file_list:
-        file_name = os.path.basename(file_path)
-        print(f"Processing {file_name}...")
-        
-        ngrams_pos = extract_ngrams_from_binary(file_path, ngram_size)
-        ngrams_with_positions[file_name] = ngrams_pos
-        all_files_ngrams[file_name] = set(ngrams_pos.keys())
+def count_common_ngrams(file_list, ngram_size=8, min_files=2):
+    """Count how many files each n-gram appears in.
     
-    # Find patterns that appear in at least min_files files
+    Files are counted one at a time; besides the set being counted, at most
+    one finished set per worker process waits to be consumed. Returns a
+    Counter of the patterns found in at least min_files files.
+    """
     pattern_counts = Counter()
-    all_patterns = set()
     
-    for file_name, ngrams in all_files_ngrams.items():
-        all_patterns.update(ngrams)
+    # Results arrive in file order so the pruning below still applies
+    ngram_sets = _iter_ngram_sets(file_list, ngram_size)
+    for index, (file_path, ngrams) in enumerate(zip(file_list, ngram_sets)):
+        print(f"Processing {os.path.basename(file_path)}...")
+        
+        # A pattern first seen now can appear in at most the remaining files;
+        # once that is fewer than min_files only known patterns are counted
+        if len(file_list) - index < min_files:
+            ngrams = ngrams.intersection(pattern_counts)
+        pattern_counts.update(ngrams)
+    
+    return Counter({pattern: count for pattern, count in pattern_counts.items()
+                    if count >= min_files})
+
+def locate_patterns(file_list, patterns):
+    """Find the positions of a few patterns in each file.
     
-    for pattern in all_patterns:
-        count = sum(1 for file_ngrams in all_files_ngrams.values() if pattern in file_ngrams)
-        if count >= min_files:
-            pattern_counts[pattern] = count
+    Returns a dictionary mapping each file name to a dictionary of the
+    patterns found in it and their positions.
+    """
+    file_positions = {}
+    for file_path in file_list:
+        # Any error reading the file was already reported while counting
+        try:
+            content = map_binary(file_path)
+        except OSError:
+            continue
+        
+        found = {}
+        for pattern in patterns:
+            positions = find_positions(content, pattern)
+            if positions:
+                found[pattern] = positions
+        file_positions[os.path.basename(file_path)] = found
+        
+        if isinstance(content, mmap.mmap):
+            content.close()
+    
+    return file_positions
+
+def analyze_files(file_list, ngram_size=8, top_count=20, min_files=2, output_file=None):
+    """Analyze a list of files for common n-grams."""
+    # First count the common patterns, then look up positions only for the
+    # ones that will be displayed
+    pattern_counts = count_common_ngrams(file_list, ngram_size, min_files)
+    top_patterns = pattern_counts.most_common(top_count)
+    file_positions = locate_patterns(file_list, [pattern for pattern, _ in top_patterns])
     
     # Prepare output
     output_lines = []
@@ -98,16 +169,15 @@ def analyze_files(file_list, ngram_size=8, top_count=20, min_files=2, output_fil
     output_dest = open(output_file, 'w') if output_file else sys.stdout
     
     # Display results
-    for pattern, count in pattern_counts.most_common(top_count):
+    for pattern, count in top_patterns:
         hex_repr, ascii_repr = format_pattern(pattern)
         
         output_lines.append(f"Pattern: {hex_repr} | ASCII: {ascii_repr} | Found in {count} files")
         
         # Show positions in each file
-        for file_name in sorted(all_files_ngrams.keys()):
-            if pattern in ngrams_with_positions[file_name]:
-                positions = ngrams_with_positions[file_name][pattern]
-                
+        for file_name in sorted(file_positions.keys()):
+            positions = file_positions[file_name].get(pattern)
+            if positions:
                 # Get the first 5 positions
                 hex_positions = [format_position(pos) for pos in positions[:5]]
                 
@@ -119,9 +189,8 @@ def analyze_files(file_list, ngram_size=8, top_count=20, min_files=2, output_fil
         
         output_lines.append("")  # Add a blank line between patterns
     
-    # Write or print output
-    for line in output_lines:
-        print(line, file=output_dest)
+    # Write or print output in a single call
+    output_dest.write('\n'.join(output_lines) + '\n')
     
     if output_file:
         output_dest.close()
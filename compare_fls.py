@@ -6,13 +6,17 @@ def read_fls_file(file_path: str) -> bytes:
 
 def find_needle_offsets(data: bytes, needle: bytes) -> list[int]:
     offsets = []
+    # After a match, skip ahead by the needle's period: the smallest shift at
+    # which it can occur again, so overlapping matches are still found
+    step = next((shift for shift in range(1, len(needle))
+                 if needle.startswith(needle[shift:])), max(len(needle), 1))
     start = 0
     while True:
         offset = data.find(needle, start)
         if offset == -1:
             break
         offsets.append(offset)
-        start = offset + 1
+        start = offset + step
     return offsets
 
 def extract_table(data: bytes, offset: int, rows: int, cols: int) -> list[list[str]]:
@@ -1,5 +1,4 @@
 import subprocess
-import re
 import argparse
 from pathlib import Path
 
@@ -53,17 +52,20 @@ def extract_map_43(output: str) -> str:
     Returns:
         str: The extracted Map #43 section, or an empty string if not found.
     """
-    # Define the pattern to match Map #43 section
-    # Look for the header and capture everything until the next map or end
-    pattern = r"\[Map #43\].*?(?=\[Map #\d+\]|$)"
+    # Locate the Map #43 header with a plain substring search
+    start = output.find("[Map #43]")
+    if start == -1:
+        return ""
     
-    # Find the Map #43 section using regex
-    match = re.search(pattern, output, re.DOTALL)
+    # The section runs until the next "[Map #<digits>]" header or the end
+    end = output.find("[Map #", start + 1)
+    while end != -1:
+        close = output.find("]", end + 6)
+        if close > end + 6 and output[end + 6:close].isdigit():
+            break
+        end = output.find("[Map #", end + 1)
     
-    if match:
-        return match.group(0).strip()
-    else:
-        return ""
+    return output[start:end if end != -1 else None].strip()
 
 def process_fls_file(fls_file: str) -> str:
     """
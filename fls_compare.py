@@ -11,9 +11,20 @@ Usage: python fls_compare.py <file1.fls> <file2.fls> [min_match_length]
 
 import sys
 import os
+import re
 import difflib
 import itertools
-from typing import List, Dict, Tuple, Set
+import mmap
+from contextlib import ExitStack, contextmanager
+from typing import List, Dict, Tuple, Set, Optional
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Size of the tiles find_byte_differences compares before diffing byte-wise
+DIFF_TILE_SIZE = 1 << 16
 
 
 def read_signatures(filename: str = "signatures.lst") -> List[str]:
@@ -38,43 +49,186 @@ def read_signatures(filename: str = "signatures.lst") -> List[str]:
         sys.exit(1)
 
 
-def search_signatures(filepath: str, signatures: List[str]) -> Dict[str, List[Tuple[int, str]]]:
+def encode_signatures(signatures: List[str]) -> List[Tuple[str, Optional[bytes], Optional[bytes]]]:
+    """
+    Encode each signature once into the byte strings searched for.
+    
+    Args:
+        signatures: List of signature strings
+        
+    Returns:
+        List of tuples (signature, ascii_bytes, utf8_bytes). ascii_bytes is
+        None when nothing of the signature is ASCII, since an empty needle
+        would match everywhere; utf8_bytes is None when the UTF-8 form is the
+        same as the ASCII form
+    """
+    encoded = []
+    for sig in signatures:
+        ascii_sig = sig.encode('ascii', errors='ignore')
+        utf8_sig = sig.encode('utf-8')
+        encoded.append((sig, ascii_sig or None, utf8_sig if utf8_sig != ascii_sig else None))
+    return encoded
+
+
+@contextmanager
+def mapped_file(filepath: str):
+    """
+    Memory-map a file read-only for the duration of a with-block.
+    
+    Args:
+        filepath: Path to the file to map
+        
+    Yields:
+        A read-only mmap of the file contents (empty bytes for an empty file,
+        which cannot be mapped)
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                yield content
+
+
+def group_needles(signatures: List[Tuple[str, Optional[bytes], Optional[bytes]]]) -> Dict[bytes, List[Tuple[str, str]]]:
+    """
+    Group the encoded signatures by needle, since several signatures can
+    encode to the same byte string.
+    
+    Args:
+        signatures: Encoded signatures from encode_signatures
+        
+    Returns:
+        Dictionary mapping each needle to its (signature, encoding) owners
+    """
+    needles = {}
+    for sig, ascii_sig, utf8_sig in signatures:
+        if ascii_sig is not None:
+            needles.setdefault(ascii_sig, []).append((sig, 'ASCII'))
+        if utf8_sig is not None:
+            needles.setdefault(utf8_sig, []).append((sig, 'UTF-8'))
+    return needles
+
+
+def collate_hits(hits, signatures: List[Tuple[str, Optional[bytes], Optional[bytes]]],
+                 results: Dict[str, List[Tuple[int, str]]]) -> None:
+    """
+    Record needle hits against their signatures. UTF-8 hits are only
+    reported where the ASCII form of the signature was not found.
+    
+    Args:
+        hits: Iterable of (position, owners) pairs, owners as from group_needles
+        signatures: Encoded signatures from encode_signatures
+        results: Dictionary mapping signatures to lists of (position, encoding),
+                 filled in place
+    """
+    ascii_positions = {sig: set() for sig, _, _ in signatures}
+    utf8_hits = []
+    for pos, owners in hits:
+        for sig, encoding in owners:
+            if encoding == 'ASCII':
+                results[sig].append((pos, encoding))
+                ascii_positions[sig].add(pos)
+            else:
+                utf8_hits.append((sig, pos))
+    
+    for sig, pos in utf8_hits:
+        if pos not in ascii_positions[sig]:
+            results[sig].append((pos, 'UTF-8'))
+
+
+def scan_signatures_automaton(content, signatures: List[Tuple[str, Optional[bytes], Optional[bytes]]],
+                              results: Dict[str, List[Tuple[int, str]]]) -> None:
+    """
+    Find all signatures in a single Aho-Corasick pass over the content.
+    
+    Args:
+        content: File contents (bytes or mmap)
+        signatures: Encoded signatures from encode_signatures
+        results: Dictionary mapping signatures to lists of (position, encoding),
+                 filled in place
+    """
+    # pyahocorasick is usually built for str keys; latin-1 maps every byte
+    # to exactly one character so positions are unchanged. Either way
+    # iter() cannot read the mapping directly, so this makes the one full
+    # copy of the file on this path
+    if ahocorasick.unicode:
+        to_key = lambda needle: needle.decode('latin-1')
+        text = str(content, 'latin-1')
+    else:
+        to_key = bytes
+        text = bytes(content)
+    
+    # Each automaton entry carries the needle length and every
+    # (signature, encoding) owner of the needle
+    automaton = ahocorasick.Automaton()
+    needles = group_needles(signatures)
+    for needle, owners in needles.items():
+        automaton.add_word(to_key(needle), (len(needle), owners))
+    
+    if len(automaton) == 0:
+        return
+    automaton.make_automaton()
+    
+    collate_hits(((end_pos - length + 1, owners)
+                  for end_pos, (length, owners) in automaton.iter(text)),
+                 signatures, results)
+
+
+def scan_signatures_regex(content, signatures: List[Tuple[str, Optional[bytes], Optional[bytes]]],
+                          results: Dict[str, List[Tuple[int, str]]]) -> None:
+    """
+    Find all signatures in a single regex pass over the content, for when
+    pyahocorasick is not installed.
+    
+    Args:
+        content: File contents (bytes or mmap)
+        signatures: Encoded signatures from encode_signatures
+        results: Dictionary mapping signatures to lists of (position, encoding),
+                 filled in place
+    """
+    needles = group_needles(signatures)
+    
+    if not needles:
+        return
+    
+    # The zero-width lookahead reports the longest needle starting at each
+    # position, so hits may overlap; every needle that is a prefix of it
+    # matches at the same position. The leading byte class lets re skip
+    # positions no needle can start at.
+    ordered = sorted(needles, key=len, reverse=True)
+    owners_at = {needle: [owner for prefix in ordered if needle.startswith(prefix)
+                          for owner in needles[prefix]]
+                 for needle in ordered}
+    first_bytes = bytes(sorted({needle[0] for needle in ordered}))
+    pattern = re.compile(b'(?=[' + re.escape(first_bytes) + b'])(?=(' +
+                         b'|'.join(map(re.escape, ordered)) + b'))')
+    
+    collate_hits(((match.start(), owners_at[match.group(1)])
+                  for match in pattern.finditer(content)),
+                 signatures, results)
+
+
+def search_signatures(filepath: str,
+                      signatures: List[Tuple[str, Optional[bytes], Optional[bytes]]]) -> Dict[str, List[Tuple[int, str]]]:
     """
     Search for signatures in the given file.
     
     Args:
         filepath: Path to the file to search
-        signatures: List of signature strings to search for
+        signatures: Encoded signatures from encode_signatures
         
     Returns:
         Dictionary mapping signatures to lists of tuples (position, encoding)
     """
-    results = {sig: [] for sig in signatures}
+    results = {sig: [] for sig, _, _ in signatures}
     
     try:
-        with open(filepath, 'rb') as f:
-            content = f.read()
-            
-        for sig in signatures:
-            ascii_sig = sig.encode('ascii', errors='ignore')
-            pos = 0
-            while True:
-                pos = content.find(ascii_sig, pos)
-                if pos == -1:
-                    break
-                results[sig].append((pos, 'ASCII'))
-                pos += 1
-                
-            utf8_sig = sig.encode('utf-8')
-            if utf8_sig != ascii_sig:
-                pos = 0
-                while True:
-                    pos = content.find(utf8_sig, pos)
-                    if pos == -1:
-                        break
-                    if not any(existing_pos == pos for existing_pos, _ in results[sig]):
-                        results[sig].append((pos, 'UTF-8'))
-                    pos += 1
+        with mapped_file(filepath) as content:
+            if ahocorasick is not None:
+                scan_signatures_automaton(content, signatures, results)
+            else:
+                scan_signatures_regex(content, signatures, results)
                     
         for sig in results:
             results[sig].sort(key=lambda x: x[0])
@@ -107,7 +261,7 @@ def compare_signatures(file1_results: Dict[str, List[Tuple[int, str]]],
     all_signatures = set(sig for sig in file1_results if file1_results[sig]) | \
                      set(sig for sig in file2_results if file2_results[sig])
     
-    for sig in all_signatures:
+    for sig in sorted(all_signatures):
         file1_positions = file1_results.get(sig, [])
         file2_positions = file2_results.get(sig, [])
         
@@ -133,11 +287,6 @@ def compare_signatures(file1_results: Dict[str, List[Tuple[int, str]]],
     return comparison
 
 
-def is_printable_ascii(byte: int) -> bool:
-    """Check if a byte represents a printable ASCII character."""
-    return 32 <= byte <= 126
-
-
 def extract_string_before(content: bytes, offset: int, max_search: int = 50, min_length: int = 4) -> Tuple[str, int]:
     """
     Search backwards from an offset to find a printable ASCII or UTF-8 string.
@@ -154,41 +303,14 @@ def extract_string_before(content: bytes, offset: int, max_search: int = 50, min
     if offset <= 0 or offset > len(content):
         return None, None
 
-    string_bytes = []
-    i = offset - 1
-
-    while i >= 0 and (offset - i) <= max_search:
-        byte = content[i]
-        
-        if is_printable_ascii(byte):
-            string_bytes.insert(0, byte)
-        else:
-            if len(string_bytes) >= min_length:
-                try:
-                    string = bytes(string_bytes).decode('ascii')
-                    return string, i + 1
-                except UnicodeDecodeError:
-                    try:
-                        string = bytes(string_bytes).decode('utf-8')
-                        return string, i + 1
-                    except UnicodeDecodeError:
-                        pass
-            string_bytes = []
-        
-        i -= 1
-
-    if len(string_bytes) >= min_length:
-        try:
-            string = bytes(string_bytes).decode('ascii')
-            return string, i + 1
-        except UnicodeDecodeError:
-            try:
-                string = bytes(string_bytes).decode('utf-8')
-                return string, i + 1
-            except UnicodeDecodeError:
-                pass
-
-    return None, None
+    # Scan the window reversed so the first run of at least min_length
+    # printable bytes is the one closest to the offset
+    window = content[max(0, offset - max_search):offset][::-1]
+    match = re.search(rb'[\x20-\x7e]{%d,}' % min_length, window)
+    if match is None:
+        return None, None
+    
+    return match.group()[::-1].decode('ascii'), offset - match.end()
 
 
 def find_byte_differences(file1_path: str, file2_path: str, min_match_length: int = 16) -> List[Tuple[int, int]]:
@@ -206,51 +328,58 @@ def find_byte_differences(file1_path: str, file2_path: str, min_match_length: in
     differences = []
     
     try:
-        with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
-            content1 = f1.read()
-            content2 = f2.read()
-        
-        min_length = min(len(content1), len(content2))
-        
-        diff_start = None
-        match_start = None
-        
-        i = 0
-        while i < min_length:
-            if content1[i] != content2[i]:
-                if diff_start is None:
-                    diff_start = i
-                    match_start = None
-                elif match_start is not None:
-                    if i - match_start < min_match_length:
-                        match_start = None
+        with mapped_file(file1_path) as content1, mapped_file(file2_path) as content2:
+            length1 = len(content1)
+            length2 = len(content2)
+            
+            min_length = min(length1, length2)
+            
+            # Skip tiles that are identical in both files; consecutive tiles
+            # that differ are grouped into one slab. A tile is never shorter
+            # than min_match_length, so regions in different slabs are always
+            # separated by enough matching bytes to stay apart.
+            tile = max(DIFF_TILE_SIZE, min_match_length)
+            slabs = []
+            for tile_start in range(0, min_length, tile):
+                tile_end = min(tile_start + tile, min_length)
+                if content1[tile_start:tile_end] != content2[tile_start:tile_end]:
+                    if slabs and slabs[-1][1] == tile_start:
+                        slabs[-1][1] = tile_end
+                    else:
+                        slabs.append([tile_start, tile_end])
+            
+            # Match whole difference regions in one regex scan per slab: runs
+            # of differing (non-zero) bytes joined across gaps of fewer than
+            # min_match_length matching bytes
+            if min_match_length > 1:
+                region = re.compile(rb'[^\x00]+(?:\x00{1,%d}[^\x00]+)*' % (min_match_length - 1))
             else:
-                if diff_start is not None and match_start is None:
-                    match_start = i
-                elif diff_start is not None and match_start is not None:
-                    if i - match_start >= min_match_length - 1:
-                        diff_length = match_start - diff_start
-                        differences.append((diff_start, diff_length))
-                        diff_start = None
-                        match_start = None
-            i += 1
+                region = re.compile(rb'[^\x00]+')
+            
+            for slab_start, slab_end in slabs:
+                # XOR the slab of both mappings as two big integers, so
+                # CPython combines them a machine word at a time; every
+                # non-zero byte of the result marks a difference. The
+                # memoryviews avoid copying and are released before the
+                # maps close.
+                with memoryview(content1)[slab_start:slab_end] as view1, \
+                        memoryview(content2)[slab_start:slab_end] as view2:
+                    diff = int.from_bytes(view1, 'little') ^ int.from_bytes(view2, 'little')
+                diff_mask = diff.to_bytes(slab_end - slab_start, 'little')
+                differences.extend((slab_start + start, end - start) for start, end in
+                                   (run.span() for run in region.finditer(diff_mask)))
         
-        if diff_start is not None:
-            if match_start is not None:
-                if min_length - match_start >= min_match_length:
-                    diff_length = match_start - diff_start
-                    differences.append((diff_start, diff_length))
-                else:
-                    diff_length = min_length - diff_start
-                    differences.append((diff_start, diff_length))
-            else:
-                diff_length = min_length - diff_start
-                differences.append((diff_start, diff_length))
+        if differences:
+            # The last segment runs to the end of the common length unless it
+            # is followed by at least min_match_length matching bytes
+            diff_start, diff_length = differences[-1]
+            if min_length - (diff_start + diff_length) < min_match_length:
+                differences[-1] = (diff_start, min_length - diff_start)
         
-        if len(content1) > len(content2):
-            differences.append((min_length, len(content1) - len(content2)))
-        elif len(content2) > len(content1):
-            differences.append((min_length, len(content2) - len(content1)))
+        if length1 > length2:
+            differences.append((min_length, length1 - length2))
+        elif length2 > length1:
+            differences.append((min_length, length2 - length1))
             
     except Exception as e:
         print(f"Error comparing file bytes: {e}")
@@ -258,6 +387,14 @@ def find_byte_differences(file1_path: str, file2_path: str, min_match_length: in
     return differences
 
 
+def format_positions(positions: List[Tuple[int, str]], limit: int) -> str:
+    """Format up to limit (position, encoding) pairs, noting how many more there are."""
+    positions_str = ', '.join([f"{pos} ({enc})" for pos, enc in positions[:limit]])
+    if len(positions) > limit:
+        positions_str += f"... ({len(positions) - limit} more)"
+    return positions_str
+
+
 def main():
     """Main function to process command line arguments and run the comparison."""
     if len(sys.argv) < 3 or len(sys.argv) > 4:
@@ -287,53 +424,42 @@ def main():
     
     signatures = read_signatures()
     print(f"Loaded {len(signatures)} signatures from signatures.lst")
+    encoded_signatures = encode_signatures(signatures)
     
     print(f"\nSearching for signatures in '{file1_path}'...")
-    file1_signatures = search_signatures(file1_path, signatures)
+    file1_signatures = search_signatures(file1_path, encoded_signatures)
     
     print(f"Searching for signatures in '{file2_path}'...")
-    file2_signatures = search_signatures(file2_path, signatures)
+    file2_signatures = search_signatures(file2_path, encoded_signatures)
     
     comparison = compare_signatures(file1_signatures, file2_signatures)
     
     print("\n=== SIGNATURE COMPARISON RESULTS ===")
     
+    name1 = os.path.basename(file1_path)
+    name2 = os.path.basename(file2_path)
+    
     if comparison['only_in_file1']:
-        print(f"\nSignatures found only in '{os.path.basename(file1_path)}' ({len(comparison['only_in_file1'])}):")
+        print(f"\nSignatures found only in '{name1}' ({len(comparison['only_in_file1'])}):")
         for sig, positions in comparison['only_in_file1'].items():
-            positions_str = ', '.join(f"{pos} ({enc})" for pos, enc in positions[:5])
-            if len(positions) > 5:
-                positions_str += f"... ({len(positions) - 5} more)"
-            print(f"  - '{sig}': {positions_str}")
+            print(f"  - '{sig}': {format_positions(positions, 5)}")
     
     if comparison['only_in_file2']:
-        print(f"\nSignatures found only in '{os.path.basename(file2_path)}' ({len(comparison['only_in_file2'])}):")
+        print(f"\nSignatures found only in '{name2}' ({len(comparison['only_in_file2'])}):")
         for sig, positions in comparison['only_in_file2'].items():
-            positions_str = ', '.join(f"{pos} ({enc})" for pos, enc in positions[:5])
-            if len(positions) > 5:
-                positions_str += f"... ({len(positions) - 5} more)"
-            print(f"  - '{sig}': {positions_str}")
+            print(f"  - '{sig}': {format_positions(positions, 5)}")
     
     if comparison['position_differences']:
         print(f"\nSignatures found at different positions ({len(comparison['position_differences'])}):")
         for sig, data in comparison['position_differences'].items():
             print(f"  - '{sig}':")
-            file1_str = ', '.join(f"{pos} ({enc})" for pos, enc in data['file1'][:5])
-            if len(data['file1']) > 5:
-                file1_str += f"... ({len(data['file1']) - 5} more)"
-            print(f"    * '{os.path.basename(file1_path)}': {file1_str}")
-            file2_str = ', '.join(f"{pos} ({enc})" for pos, enc in data['file2'][:5])
-            if len(data['file2']) > 5:
-                file2_str += f"... ({len(data['file2']) - 5} more)"
-            print(f"    * '{os.path.basename(file2_path)}': {file2_str}")
+            print(f"    * '{name1}': {format_positions(data['file1'], 5)}")
+            print(f"    * '{name2}': {format_positions(data['file2'], 5)}")
     
     if comparison['same']:
         print(f"\nSignatures found at identical positions ({len(comparison['same'])}):")
         for sig, positions in comparison['same'].items():
-            positions_str = ', '.join(f"{pos} ({enc})" for pos, enc in positions[:3])
-            if len(positions) > 3:
-                positions_str += f"... ({len(positions) - 3} more)"
-            print(f"  - '{sig}': {positions_str}")
+            print(f"  - '{sig}': {format_positions(positions, 3)}")
     
     print("\n=== BYTE SEQUENCE DIFFERENCES ===")
     byte_differences = find_byte_differences(file1_path, file2_path, min_match_length)
@@ -353,39 +479,50 @@ def main():
         byte_differences.sort(key=lambda x: x[0])
         
         print("\nDifference details:")
-        with open(file1_path, 'rb') as f1, open(file2_path, 'rb') as f2:
-            content1 = f1.read()
-            content2 = f2.read()
+        with ExitStack() as stack:
+            # Map both files once and slice each preview straight from them;
+            # if that fails, every difference is still listed with the error
+            try:
+                content1 = stack.enter_context(mapped_file(file1_path))
+                content2 = stack.enter_context(mapped_file(file2_path))
+                map_error = None
+            except Exception as e:
+                map_error = e
             
             for i, (start, length) in enumerate(byte_differences[:20]):
                 print(f"  {i+1}. Position: {start}, Length: {length} bytes")
                 
-                # Search for string before the difference in file1
-                string1, string1_offset = extract_string_before(content1, start)
-                if string1:
-                    print(f"     Preceding string (File1) at offset {string1_offset}: '{string1}'")
-                else:
-                    print(f"     No preceding string found in File1 within 50 bytes")
-                
-                # Search for string before the difference in file2
-                string2, string2_offset = extract_string_before(content2, start)
-                if string2:
-                    print(f"     Preceding string (File2) at offset {string2_offset}: '{string2}'")
-                else:
-                    print(f"     No preceding string found in File2 within 50 bytes")
-                
-                # Hex preview
-                f1.seek(start)
-                f2.seek(start)
-                preview_length = min(length, 16)
-                bytes1 = f1.read(preview_length)
-                bytes2 = f2.read(preview_length)
-                
-                hex1 = ' '.join(f"{b:02x}" for b in bytes1)
-                hex2 = ' '.join(f"{b:02x}" for b in bytes2)
+                if map_error is not None:
+                    print(f"     Error getting preview: {map_error}")
+                    continue
                 
-                print(f"     File1: {hex1}")
-                print(f"     File2: {hex2}")
+                try:
+                    # Search for string before the difference in file1
+                    string1, string1_offset = extract_string_before(content1, start)
+                    if string1:
+                        print(f"     Preceding string (File1) at offset {string1_offset}: '{string1}'")
+                    else:
+                        print(f"     No preceding string found in File1 within 50 bytes")
+                    
+                    # Search for string before the difference in file2
+                    string2, string2_offset = extract_string_before(content2, start)
+                    if string2:
+                        print(f"     Preceding string (File2) at offset {string2_offset}: '{string2}'")
+                    else:
+                        print(f"     No preceding string found in File2 within 50 bytes")
+                    
+                    # Hex preview, sliced straight from the mappings
+                    preview_length = min(length, 16)
+                    bytes1 = content1[start:start + preview_length]
+                    bytes2 = content2[start:start + preview_length]
+                    
+                    hex1 = bytes1.hex(' ')
+                    hex2 = bytes2.hex(' ')
+                    
+                    print(f"     File1: {hex1}")
+                    print(f"     File2: {hex2}")
+                except Exception as e:
+                    print(f"     Error getting preview: {e}")
         
         if len(byte_differences) > 20:
             print(f"\n... and {len(byte_differences) - 20} more differences")
@@ -2,22 +2,28 @@ import os
 import glob
 import argparse
 
+# translate() table for the dump's ASCII column: unprintable bytes show as dots
+ASCII_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
 def print_hex_dump(data: bytes, start: int, end: int, label: str) -> None:
     """Print a hex dump of data from start to end with a label."""
     if start < 0 or end > len(data) or start >= end:
         print(f"Invalid range for {label}: 0x{start:x} to 0x{end:x}")
         return
     
-    print(f"\n{label} (0x{start:x} to 0x{end:x}):")
+    output_lines = [f"\n{label} (0x{start:x} to 0x{end:x}):"]
     for i in range(start, end, 16):  # 16 bytes per line
         line = data[i:min(i + 16, end)]
         # Hex representation
-        hex_str = ' '.join(f'{b:02x}' for b in line)
+        hex_str = line.hex(' ')
         # ASCII representation (printable chars or '.')
-        ascii_str = ''.join(chr(b) if 32 <= b < 127 else '.' for b in line)
+        ascii_str = line.translate(ASCII_TABLE).decode('ascii')
         # Pad hex string for alignment if less than 16 bytes
         hex_str = hex_str.ljust(47)  # 16 * 2 (hex) + 15 (spaces) = 47
-        print(f"0x{i:06x}: {hex_str}  {ascii_str}")
+        output_lines.append(f"0x{i:06x}: {hex_str}  {ascii_str}")
+    
+    # Print the whole dump in a single call
+    print('\n'.join(output_lines))
 
 def dump_regions(file_path: str) -> None:
     """Dump hex for specified regions in an FLS file."""
@@ -8,9 +8,13 @@ map tables used in the ECU's programming.
 """
 
 import argparse
+import mmap
+import re
 import struct
 import os
 import sys
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional, Union
 
 # Constants
@@ -19,6 +23,13 @@ ROM_1MB_MASK = 0x100000
 MAX_TABLE_SEARCHES = 4000
 MAX_SEARCH_BACK_BYTES = 3500
 
+# Little-endian unsigned value formats, keyed by width in bytes
+NWIDTH_CODES = {1: 'B', 2: 'H', 4: 'I'}
+NWIDTH_STRUCTS = {nwidth: struct.Struct("<" + code) for nwidth, code in NWIDTH_CODES.items()}
+
+# The four immediates of the "mov DPPx, #XXXXh" setup sequence
+DPP_SETUP_WORDS = struct.Struct("<2xH2xH2xH2xH")
+
 # Placeholder for table definitions
 class TableDef:
     """Definition of a table structure for display"""
@@ -96,14 +107,14 @@ XXXX = 0x00
 MASK = 0xff
 
 # Define needle patterns for 1D map finders
-mapfinder_needle = bytearray([
+mapfinder_needle = bytes([
     0xE6, 0xFC, XXXX, XXXX,  # mov     r12, #(MAP_X_NUM - ROM_MAP_REGION_818000)
     0xE6, 0xFD, XXXX, XXXX,  # mov     r13, #XXXXh
     0xC2, 0xFE, XXXX, XXXX,  # movbz   r14, XXXX
     0xDA, XXXX, XXXX, XXXX,  # calls   XXXXh, Lookup_Table_Data
 ])
 
-mapfinder_mask = bytearray([
+mapfinder_mask = bytes([
     MASK, MASK, XXXX, XXXX,  # mov     r12, #(MAP_X_NUM - ROM_MAP_REGION_818000)
     MASK, MASK, XXXX, XXXX,  # mov     r13, #XXXXh
     MASK, MASK, XXXX, XXXX,  # movbz   r14, XXXX
@@ -111,7 +122,7 @@ mapfinder_mask = bytearray([
 ])
 
 # Define needle patterns for 2D map finders
-mapfinder_xy2_needle = bytearray([
+mapfinder_xy2_needle = bytes([
     0xE6, 0xF4, XXXX, XXXX,  # mov     r4, #XXXX_DATA_TBL
     0xE6, 0xF5, XXXX, XXXX,  # mov     r5, #XXXXh
     0x88, 0x50,              # mov     [-r0], r5
@@ -129,7 +140,7 @@ mapfinder_xy2_needle = bytearray([
     0xDA, XXXX, XXXX, XXXX,  # calls   XXXXh, XXXX_Lookup_func
 ])
 
-mapfinder_xy2_mask = bytearray([
+mapfinder_xy2_mask = bytes([
     MASK, MASK, XXXX, XXXX,  # mov     r4, #XXXX_DATA_TBL
     MASK, MASK, XXXX, XXXX,  # mov     r5, #XXXXh
     MASK, MASK,              # mov     [-r0], r5
@@ -148,7 +159,7 @@ mapfinder_xy2_mask = bytearray([
 ])
 
 # Define needle patterns for single axis map finders
-mapfinder_xy3_needle = bytearray([
+mapfinder_xy3_needle = bytes([
     0x88, 0x50,              # mov     [-r0], r5
     0xE6, 0xFC, XXXX, XXXX,  # mov     r12, #XXXX
     0xE6, 0xFD, XXXX, XXXX,  # mov     r13, #XXXXh
@@ -158,7 +169,7 @@ mapfinder_xy3_needle = bytearray([
     0x08, 0x04               # add     r0,  #4
 ])
 
-mapfinder_xy3_mask = bytearray([
+mapfinder_xy3_mask = bytes([
     MASK, MASK,              # mov     [-r0], r5
     MASK, MASK, XXXX, XXXX,  # mov     r12, #XXXX
     MASK, MASK, XXXX, XXXX,  # mov     r13, #XXXXh
@@ -168,6 +179,21 @@ mapfinder_xy3_mask = bytearray([
     MASK, MASK
 ])
 
+# Define needle pattern for the main ROM DPPx setup
+dpp_needle = bytes([
+    0xE6, 0x00, XXXX, XXXX,  # mov     DPP0, #XXXXh
+    0xE6, 0x01, XXXX, XXXX,  # mov     DPP1, #XXXXh
+    0xE6, 0x02, XXXX, XXXX,  # mov     DPP2, #XXXXh
+    0xE6, 0x03, XXXX, XXXX,  # mov     DPP3, #XXXXh
+])
+
+dpp_mask = bytes([
+    MASK, MASK, XXXX, XXXX,  # mov     DPP0, #XXXXh
+    MASK, MASK, XXXX, XXXX,  # mov     DPP1, #XXXXh
+    MASK, MASK, XXXX, XXXX,  # mov     DPP2, #XXXXh
+    MASK, MASK, XXXX, XXXX,  # mov     DPP3, #XXXXh
+])
+
 # Global variables for configuration
 show_phy = True
 show_hex = True
@@ -176,37 +202,64 @@ show_diss = False
 dpp1_value = 0x0205  # Default DPP1 value for segment calculations
 seg_start = 0x800000  # Starting segment address for display
 
+@contextmanager
+def mapped_file(filepath: str):
+    """Memory-map a file read-only for the duration of a with-block.
+    Empty files cannot be mapped, so they are given as empty bytes.
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as rom_data:
+                yield rom_data
+
 def get16(data: bytes, offset: int = 0) -> int:
     """Extract a 16-bit little-endian value from data."""
     if offset + 2 > len(data):
         return 0
-    return struct.unpack("<H", data[offset:offset+2])[0]
+    return NWIDTH_STRUCTS[2].unpack_from(data, offset)[0]
 
 def get32(data: bytes, offset: int = 0) -> int:
     """Extract a 32-bit little-endian value from data."""
     if offset + 4 > len(data):
         return 0
-    return struct.unpack("<I", data[offset:offset+4])[0]
+    return NWIDTH_STRUCTS[4].unpack_from(data, offset)[0]
 
 def get_nwidth(data: bytes, offset: int, nwidth: int) -> int:
     """Extract a value of specified width from data."""
-    if offset >= len(data):
-        return 0
-        
-    if nwidth == 0:
-        return 0
-    elif nwidth == 1:
-        if offset < len(data):
-            return data[offset]
-        return 0
-    elif nwidth == 2:
-        return get16(data, offset)
-    elif nwidth == 4:
-        return get32(data, offset)
-    else:
+    unpacker = NWIDTH_STRUCTS.get(nwidth)
+    if unpacker is None or offset + nwidth > len(data):
         return 0
+    return unpacker.unpack_from(data, offset)[0]
 
-def search(rom_data: bytes, needle: bytearray, mask: bytearray, start_offset: int = 0) -> Optional[int]:
+def get_nwidth_values(data: bytes, offset: int, count: int, nwidth: int) -> List[int]:
+    """Extract count consecutive values of specified width from data in one unpack.
+    Values that do not fit in data are returned as 0, as get_nwidth does.
+    """
+    code = NWIDTH_CODES.get(nwidth)
+    available = max(0, min(count, (len(data) - offset) // nwidth)) if code else 0
+    values = list(struct.unpack_from(f"<{available}{code}", data, offset)) if available else []
+    return values + [0] * (count - available)
+
+@lru_cache(maxsize=None)
+def compile_needle(needle: bytes, mask: bytes) -> re.Pattern:
+    """Compile a masked needle into a regex so it is matched in C.
+    Bytes with a zero mask match anything; the rest must match on the masked bits.
+    Needles are constants, so each is only compiled once.
+    """
+    parts = []
+    for byte, byte_mask in zip(needle, mask):
+        if byte_mask == 0:
+            parts.append(b'.')
+        elif byte_mask == MASK:
+            parts.append(re.escape(bytes([byte])))
+        else:
+            allowed = bytes(b for b in range(256) if b & byte_mask == byte & byte_mask)
+            parts.append(b'[' + re.escape(allowed) + b']')
+    return re.compile(b''.join(parts), re.DOTALL)
+
+def search(rom_data: bytes, needle: bytes, mask: bytes, start_offset: int = 0) -> Optional[int]:
     """Search for a pattern with a mask in a binary file starting from offset.
     Returns the offset where pattern is found, or None if not found.
     """
@@ -219,20 +272,25 @@ def search(rom_data: bytes, needle: bytearray, mask: bytearray, start_offset: in
         if end <= start_offset:
             return None
             
-        for i in range(start_offset, end):
-            match = True
-            for j in range(needle_len):
-                # Only check where mask is non-zero
-                if mask[j] != 0 and (rom_data[i + j] & mask[j]) != (needle[j] & mask[j]):
-                    match = False
-                    break
-            if match:
-                return i
-        return None
+        # As before, a match may not end on the last byte of the ROM
+        match = compile_needle(bytes(needle), bytes(mask)).search(rom_data, start_offset, len(rom_data) - 1)
+        return match.start() if match else None
     except Exception as e:
         print(f"Search error: {e}")
         return None
 
+def search_all(rom_data: bytes, needle: bytes, mask: bytes) -> List[int]:
+    """Find every non-overlapping occurrence of a pattern with a mask in one pass.
+    Returns the offsets in the order repeated search calls, each resuming just
+    past the previous match, would find them.
+    """
+    if len(needle) != len(mask):
+        raise ValueError("Needle and mask must be the same length")
+    
+    # As with search, a match may not end on the last byte of the ROM
+    pattern = compile_needle(bytes(needle), bytes(mask))
+    return [match.start() for match in pattern.finditer(rom_data, 0, len(rom_data) - 1)]
+
 def safe_read(data: bytes, offset: int, length: int = 1) -> bytes:
     """Safely read data from a buffer with bounds checking."""
     try:
@@ -252,6 +310,16 @@ def is_valid_table_address(addr: int, rom_size: int) -> bool:
     """Check if a table address is valid within the ROM"""
     return 0 <= addr < rom_size
 
+def count_valid_addresses(start: int, step: int, count: int, rom_size: int) -> int:
+    """Count how many of the addresses start, start + step, ... (count of them,
+    ascending) are valid, i.e. the length of the run before the end of the ROM.
+    """
+    if not is_valid_table_address(start, rom_size):
+        return 0
+    if step == 0:
+        return count
+    return min(count, (rom_size - start + step - 1) // step)
+
 def show_entry_def(entry: Dict, nwidth: int) -> None:
     """Display entry definition information"""
     if nwidth == 0:
@@ -377,115 +445,82 @@ def dump_table(rom_data: bytes, table_addr: int, segment: int, table_def: TableD
         print(f"    Address:                   0x{rom_adr:x}")
         print(f"    Value:\n")
 
-        # Print X-axis headers
-        print(" No.           | ", end="")
-        for i in range(x_num):
-            print(f"    {i:4d} ", end="")
-        print()
+        # Print X-axis headers; each line below is built up and printed in one
+        # call, with whole rows formatted by a single % where every entry is shown
+        print(" No.           | " + ("    %4d " * x_num) % tuple(range(x_num)))
 
-        # Common conversion function with operation type handling
-        def convert_value(raw_value, conv_info):
+        # Common conversion with operation type handling, specialised once per
+        # entry so the conversion fields are not re-read for every value
+        def make_converter(conv_info):
             conv_value = float(conv_info['conv'])
             operation = conv_info.get('otype', '/')
             conv2 = conv_info.get('conv2')
+            # Only 'x' and 'd' subtract the secondary conversion value
+            offset = float(conv2) if conv2 and operation in ('x', 'd') else 0.0
             
-            if operation == '*':
-                result = raw_value * conv_value
-            elif operation == 'x':
-                result = raw_value * conv_value
-                if conv2:
-                    result -= float(conv2)
-            elif operation == 'd':
-                result = raw_value / conv_value
-                if conv2:
-                    result -= float(conv2)
-            else:  # Default is '/'
-                result = raw_value / conv_value
-                
-            return result
+            if operation in ('*', 'x'):
+                return lambda raw_value: raw_value * conv_value - offset
+            # 'd' and the default '/'
+            return lambda raw_value: raw_value / conv_value - offset
+
+        convert_x_axis = make_converter(table_def.x_axis)
+        convert_y_axis = make_converter(table_def.y_axis)
+        convert_cell = make_converter(table_def.cell)
+
+        # Decode the axis and cell blocks with one unpack each
+        x_axis_values = get_nwidth_values(rom_data, x_axis_header_data_start, x_num, table_def.x_axis_nwidth)
+        y_axis_values = get_nwidth_values(rom_data, y_axis_header_data_start, y_num, table_def.y_axis_nwidth)
+        cell_count = x_num * y_num if y_num > 0 else x_num
+        cells = get_nwidth_values(rom_data, cell_data_start, cell_count, table_def.cell_nwidth)
 
         # Print X-axis values in physical format
         if show_phy:
-            print("            PHY| ", end="")
-            for i in range(x_num):
-                try:
-                    offset = x_axis_header_data_start + (i * table_def.x_axis_nwidth)
-                    entry = get_nwidth(rom_data, offset, table_def.x_axis_nwidth)
-                    formatted_value = convert_value(entry, table_def.x_axis)
-                    print(f"{formatted_value:8.2f} ", end="")
-                except Exception as e:
-                    print("   ???  ", end="")
-            print()
+            try:
+                # The conversion either fails for every value or for none
+                row = ("%8.2f " * x_num) % tuple(map(convert_x_axis, x_axis_values))
+            except Exception:
+                row = "   ???  " * x_num
+            print("            PHY| " + row)
 
         # Print X-axis values in hex format
         if show_hex:
-            print("            HEX| ", end="")
-            for i in range(x_num):
-                try:
-                    offset = x_axis_header_data_start + (i * table_def.x_axis_nwidth)
-                    entry = get_nwidth(rom_data, offset, table_def.x_axis_nwidth)
-                    print(f"0x{entry:X} ", end="")
-                except Exception:
-                    print("   ???  ", end="")
-            print()
+            print("            HEX| " + ("0x%X " * x_num) % tuple(x_axis_values))
 
         # Print X-axis addresses
         if show_adr:
-            print("            ADR| ", end="")
-            for i in range(x_num):
-                addr = x_axis_header_data_start + (i * table_def.x_axis_nwidth)
-                print(f"0x{addr + seg_start:X} ", end="")
-            print()
+            x_axis_adrs = tuple(x_axis_header_data_start + (i * table_def.x_axis_nwidth) + seg_start
+                                for i in range(x_num))
+            print("            ADR| " + ("0x%X " * x_num) % x_axis_adrs)
 
         # Separator line
-        print(" --------------+", end="")
-        for i in range(x_num):
-            print("---------", end="")
-        print()
+        print(" --------------+" + "---------" * x_num)
 
         # For 1D tables (y_num = 0), print just one row
         if y_num == 0:
+            # For 1D tables, the cell data often follows the x_axis data.
+            # Cells past the end of the ROM are shown as '???'
+            shown = count_valid_addresses(cell_data_start, table_def.cell_nwidth, x_num, len(rom_data))
+            missing = "   ???  " * (x_num - shown)
+            
             if show_phy:
-                print("            PHY| ", end="")
-                for i in range(x_num):
-                    try:
-                        # For 1D tables, the cell data often follows the x_axis data
-                        offset = cell_data_start + (i * table_def.cell_nwidth)
-                        if is_valid_table_address(offset, len(rom_data)):
-                            entry = get_nwidth(rom_data, offset, table_def.cell_nwidth)
-                            formatted_value = convert_value(entry, table_def.cell)
-                            print(f"{formatted_value:8.0f} ", end="")
-                        else:
-                            print("   ???  ", end="")
-                    except Exception as e:
-                        print("   ???  ", end="")
-                print()
+                try:
+                    # The conversion either fails for every value or for none
+                    row = ("%8.0f " * shown) % tuple(map(convert_cell, cells[:shown]))
+                except Exception:
+                    row = "   ???  " * shown
+                print("            PHY| " + row + missing)
                 
             if show_hex:
-                print("            HEX| ", end="")
-                for i in range(x_num):
-                    try:
-                        offset = cell_data_start + (i * table_def.cell_nwidth)
-                        if is_valid_table_address(offset, len(rom_data)):
-                            entry = get_nwidth(rom_data, offset, table_def.cell_nwidth)
-                            print(f"  {entry:#6x} ", end="")
-                        else:
-                            print("   ???  ", end="")
-                    except Exception:
-                        print("   ???  ", end="")
-                print()
+                print("            HEX| " + ("  %#6x " * shown) % tuple(cells[:shown]) + missing)
                 
             if show_adr:
-                print("            ADR| ", end="")
-                for i in range(x_num):
-                    addr = cell_data_start + (i * table_def.cell_nwidth)
-                    if is_valid_table_address(addr, len(rom_data)):
-                        print(f"0x{addr + seg_start:X} ", end="")
-                    else:
-                        print("   ???  ", end="")
-                print()
+                cell_adrs = tuple(cell_data_start + (i * table_def.cell_nwidth) + seg_start for i in range(shown))
+                print("            ADR| " + ("0x%X " * shown) % cell_adrs + missing)
         # For 2D tables, print each row
         else:
+            # Cells are stored column by column: a row's cells are y_num
+            # values apart in the decoded block and row_stride bytes apart in the ROM
+            row_stride = y_num * table_def.cell_nwidth
             for y_pos in range(y_num):
                 try:
                     # Get y-axis header data
@@ -493,56 +528,35 @@ def dump_table(rom_data: bytes, table_addr: int, segment: int, table_def: TableD
                     if not is_valid_table_address(y_axis_adr, len(rom_data)):
                         continue
                         
-                    y_axis_value_raw = get_nwidth(rom_data, y_axis_adr, table_def.y_axis_nwidth)
-                    y_axis_value_fmt = convert_value(y_axis_value_raw, table_def.y_axis)
+                    y_axis_value_raw = y_axis_values[y_pos]
+                    y_axis_value_fmt = convert_y_axis(y_axis_value_raw)
+                    
+                    # Cells past the end of the ROM are shown as '???'
+                    row_start = cell_data_start + (y_pos * table_def.cell_nwidth)
+                    shown = count_valid_addresses(row_start, row_stride, x_num, len(rom_data))
+                    row_cells = cells[y_pos::y_num][:shown]
+                    missing = "   ???  " * (x_num - shown)
 
                     # Print Y-axis value and row for physical values
                     if show_phy:
-                        print(f" {y_axis_value_fmt:5.0f}     PHY| ", end="")
-                        for x_pos in range(x_num):
-                            try:
-                                # Get cell data
-                                cell_adr = cell_data_start + (x_pos * (y_num * table_def.cell_nwidth)) + (y_pos * table_def.cell_nwidth)
-                                if is_valid_table_address(cell_adr, len(rom_data)):
-                                    entry = get_nwidth(rom_data, cell_adr, table_def.cell_nwidth)
-                                    formatted_value = convert_value(entry, table_def.cell)
-                                    print(f"{formatted_value:8.0f} ", end="")
-                                else:
-                                    print("   ???  ", end="")
-                            except Exception:
-                                print("   ???  ", end="")
-                        print()
+                        line = f" {y_axis_value_fmt:5.0f}     PHY| "
+                        try:
+                            # The conversion either fails for every value or for none
+                            row = ("%8.0f " * shown) % tuple(map(convert_cell, row_cells))
+                        except Exception:
+                            row = "   ???  " * shown
+                        print(line + row + missing)
                     
                     # Print row for hex values
                     if show_hex:
-                        print(f"  {y_axis_value_raw:#8.4x} HEX| ", end="")
-                        for x_pos in range(x_num):
-                            try:
-                                # Get cell data
-                                cell_adr = cell_data_start + (x_pos * (y_num * table_def.cell_nwidth)) + (y_pos * table_def.cell_nwidth)
-                                if is_valid_table_address(cell_adr, len(rom_data)):
-                                    entry = get_nwidth(rom_data, cell_adr, table_def.cell_nwidth)
-                                    print(f"  {entry:#6x} ", end="")
-                                else:
-                                    print("   ???  ", end="")
-                            except Exception:
-                                print("   ???  ", end="")
-                        print()
+                        line = f"  {y_axis_value_raw:#8.4x} HEX| "
+                        print(line + ("  %#6x " * shown) % tuple(row_cells) + missing)
                     
                     # Print row for addresses
                     if show_adr:
-                        print(f"  {y_axis_adr + seg_start:#9.5x} ADR| ", end="")
-                        for x_pos in range(x_num):
-                            try:
-                                # Get cell address
-                                cell_adr = cell_data_start + (x_pos * (y_num * table_def.cell_nwidth)) + (y_pos * table_def.cell_nwidth)
-                                if is_valid_table_address(cell_adr, len(rom_data)):
-                                    print(f"0x{cell_adr + seg_start:X} ", end="")
-                                else:
-                                    print("   ???  ", end="")
-                            except Exception:
-                                print("   ???  ", end="")
-                        print()
+                        line = f"  {y_axis_adr + seg_start:#9.5x} ADR| "
+                        cell_adrs = tuple(row_start + (x_pos * row_stride) + seg_start for x_pos in range(shown))
+                        print(line + ("0x%X " * shown) % cell_adrs + missing)
                 except Exception as e:
                     print(f"Error processing row {y_pos}: {e}")
 
@@ -558,16 +572,11 @@ def dump_table(rom_data: bytes, table_addr: int, segment: int, table_def: TableD
 
 def find_multi_map_type1(rom_data: bytes) -> None:
     """Find and display 2D maps in the ROM (Type 1)."""
-    current_offset = 0
     map_count = 0
     
     try:
-        while True:
-            # Search for the next occurrence of the pattern
-            current_offset = search(rom_data, mapfinder_xy2_needle, mapfinder_xy2_mask, current_offset)
-            if current_offset is None:
-                break
-                
+        # Find every occurrence of the pattern up front
+        for current_offset in search_all(rom_data, mapfinder_xy2_needle, mapfinder_xy2_mask):
             map_count += 1
             print(f"\n------------------------------------------------------------------")
             print(f"[Map #{map_count}] Multi Axis Map Type #1 function found at: offset=0x{current_offset:x} \n")
@@ -580,9 +589,6 @@ def find_multi_map_type1(rom_data: bytes) -> None:
                 
                 # Dump the table
                 dump_table(rom_data, table_adr, segment, XXXX_table, 0)
-            
-            # Continue searching from the next position
-            current_offset += len(mapfinder_xy2_needle)
     except Exception as e:
         print(f"Error in find_multi_map_type1: {e}")
 
@@ -606,23 +612,16 @@ def find_multi_map_type2(rom_data: bytes) -> None:
             print(f"\n------------------------------------------------------------------")
             print(f"[Map #{map_count}] Multi Map Type #2 lookup function found @ offset: 0x{addr:x} \n")
             
-            # Backtrack to try to find the start of the function
-            backtrack_pos = addr
-            backtrack_count = 0
-            try:
-                while backtrack_count < MAX_SEARCH_BACK_BYTES:
-                    backtrack_count += 1
-                    if backtrack_pos <= 0:
-                        break
-                        
-                    if backtrack_pos + 1 < len(rom_data) and rom_data[backtrack_pos] == 0xDB and rom_data[backtrack_pos+1] == 0x00:  # 'rets' instruction
-                        backtrack_count += 1
-                        print(f"Found estimated function start address: 0x{backtrack_pos:x}")
-                        break
-                        
-                    backtrack_pos -= 1
-            except Exception as e:
-                print(f"Backtrack error: {e}")
+            # Backtrack to try to find the start of the function: the nearest
+            # 'rets' instruction within MAX_SEARCH_BACK_BYTES, not counting offset 0
+            lowest_pos = max(1, addr - MAX_SEARCH_BACK_BYTES + 1)
+            backtrack_pos = rom_data.rfind(b'\xDB\x00', lowest_pos, addr + 2)
+            if backtrack_pos != -1:
+                # Bytes stepped back over, plus one more counted for the match
+                backtrack_count = addr - backtrack_pos + 2
+                print(f"Found estimated function start address: 0x{backtrack_pos:x}")
+            else:
+                backtrack_count = min(addr + 1, MAX_SEARCH_BACK_BYTES)
                 
             print(f"Backtrack offset: 0x{addr:x} ({backtrack_count} bytes)\n")
             
@@ -661,25 +660,18 @@ def find_multi_map_type2(rom_data: bytes) -> None:
 
 def find_1d_maps(rom_data: bytes) -> None:
     """Find and display 1D simple maps in the ROM."""
-    current_offset = 0
     map_count = 0
     
     print("-[ Generic X-Axis MAP Table Scanner! ]---------------------------------------------------------------------\n")
     print(">>> Scanning for Map Tables #1 Checking sub-routine [map finder!] \n")
     
     try:
-        while map_count < MAX_TABLE_SEARCHES:
-            # Search for the pattern
-            current_offset = search(rom_data, mapfinder_needle, mapfinder_mask, current_offset)
-            if current_offset is None:
-                break
-                
-            addr = current_offset
+        # Find every occurrence of the pattern up front
+        for addr in search_all(rom_data, mapfinder_needle, mapfinder_mask)[:MAX_TABLE_SEARCHES]:
             map_count += 1
             
             # Check if we have enough data to extract map information
             if addr + 10 >= len(rom_data):
-                current_offset += len(mapfinder_needle)
                 continue
             
             # Extract the map information
@@ -693,7 +685,6 @@ def find_1d_maps(rom_data: bytes) -> None:
                 # Ensure map_adr is within range of rom_data
                 if not is_valid_table_address(map_adr, len(rom_data)) or not is_valid_table_address(map_adr + 1, len(rom_data)):
                     print(f"[Map #{map_count}] 1D X-Axis  : Map function found at: offset=0x{addr:x} phy:0x{map_adr:x}, file-offset=0x{map_adr:x} x-axis=Invalid map address: 0x{map_adr:x}")
-                    current_offset += len(mapfinder_needle)
                     continue
                 
                 x_axis = rom_data[map_adr]              # Number of entries
@@ -702,28 +693,19 @@ def find_1d_maps(rom_data: bytes) -> None:
                 # Ensure x_axis is reasonable
                 if x_axis > 50 or x_axis == 0:  # Cap to prevent unreasonable values
                     print(f"[Map #{map_count}] 1D X-Axis  : Map function found at: offset=0x{addr:x} phy:0x{phys_addr:x}, file-offset=0x{map_adr:x} x-axis=Invalid count: {x_axis}")
-                    current_offset += len(mapfinder_needle)
                     continue
                     
                 # Ensure we have enough data to read the entire table
                 if not is_valid_table_address(table_start + x_axis - 1, len(rom_data)):
                     print(f"[Map #{map_count}] 1D X-Axis  : Map function found at: offset=0x{addr:x} phy:0x{phys_addr:x}, file-offset=0x{map_adr:x} x-axis=Table extends beyond file boundary")
-                    current_offset += len(mapfinder_needle)
                     continue
                 
                 print(f"[Map #{map_count}] 1D X-Axis  : Map function found at: offset=0x{addr:x} phy:0x{phys_addr:x}, file-offset=0x{table_start:x} x-axis={x_axis}")
                 
-                # Display table values
-                print("\t", end="")
-                for x in range(x_axis):
-                    if is_valid_table_address(table_start + x, len(rom_data)):
-                        print(f"{rom_data[table_start + x]:02x} ", end="")
-                print()
+                # Display table values; the whole table was bounds-checked above
+                print("\t" + rom_data[table_start:table_start + x_axis].hex(' ') + " ")
             except Exception as e:
                 print(f"Error processing map #{map_count}: {e}")
-            
-            # Continue from the next position
-            current_offset += len(mapfinder_needle)
         
         print("\n")
     except Exception as e:
@@ -736,21 +718,6 @@ def check_dppx(rom_data: bytes) -> None:
     print("-[ DPPx Setup Analysis ]-----------------------------------------------------------------\n")
     print(">>> Scanning for Main ROM DPPx setup #1 [to extract dpp0, dpp1, dpp2, dpp3 from rom] \n")
     
-    # DPP needle pattern
-    dpp_needle = bytearray([
-        0xE6, 0x00, XXXX, XXXX,   # mov     DPP0, #XXXXh
-        0xE6, 0x01, XXXX, XXXX,   # mov     DPP1, #XXXXh
-        0xE6, 0x02, XXXX, XXXX,   # mov     DPP2, #XXXXh 
-        0xE6, 0x03, XXXX, XXXX    # mov     DPP3, #XXXX
-    ])
-    
-    dpp_mask = bytearray([
-        MASK, MASK, XXXX, XXXX,   # mov     DPP0, #XXXXh
-        MASK, MASK, XXXX, XXXX,   # mov     DPP1, #XXXXh
-        MASK, MASK, XXXX, XXXX,   # mov     DPP2, #XXXXh 
-        MASK, MASK, XXXX, XXXX    # mov     DPP3, #XXXX
-    ])
-    
     addr = search(rom_data, dpp_needle, dpp_mask, 0)
     
     if addr is None:
@@ -760,10 +727,7 @@ def check_dppx(rom_data: bytes) -> None:
         print(f"\nmain rom dppX byte sequence #1 found at offset=0x{addr:x}.\n")
         
         # Extract DPP values
-        dpp0 = get16(rom_data, addr + 2)
-        dpp1 = get16(rom_data, addr + 6)
-        dpp2 = get16(rom_data, addr + 10)
-        dpp3 = get16(rom_data, addr + 14)
+        dpp0, dpp1, dpp2, dpp3 = DPP_SETUP_WORDS.unpack_from(rom_data, addr)
         
         # Store dpp1_value for segment calculations
         dpp1_value = dpp1
@@ -818,19 +782,18 @@ def main():
     print(f"Opening '{args.romfile}' file")
     
     try:
-        with open(args.romfile, 'rb') as f:
-            rom_data = f.read()
-        
-        print(f"Succeded loading file.")
-        print(f"Loaded ROM: Tool in 1Mb Mode\n")
-        
-        # Extract DPP values first as we need them for address calculations
-        if not args.skip:
-            check_dppx(rom_data)
-            check_basic_info(rom_data)
-        
-        # Run the map scanner
-        check_multimap(rom_data)
+        # Map the ROM once and share it between all the scanners
+        with mapped_file(args.romfile) as rom_data:
+            print(f"Succeded loading file.")
+            print(f"Loaded ROM: Tool in 1Mb Mode\n")
+            
+            # Extract DPP values first as we need them for address calculations
+            if not args.skip:
+                check_dppx(rom_data)
+                check_basic_info(rom_data)
+            
+            # Run the map scanner
+            check_multimap(rom_data)
             
     except FileNotFoundError:
         print(f"Error: ROM file '{args.romfile}' not found")
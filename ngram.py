@@ -2,19 +2,22 @@ import os
 import re
 from collections import Counter
 
+ASCII_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
 def extract_ngrams_with_positions(file_path, n=8):
     """Extract n-byte sequences from a hex dump file with their positions."""
     try:
         with open(file_path, 'r') as f:
             content = f.read()
         
-        # Extract only valid hex pairs
-        hex_bytes = re.findall(r'[0-9a-f]{2}', content.lower())
+        # Extract only valid hex pairs and decode them once into raw bytes
+        data = bytes.fromhex(''.join(re.findall(r'[0-9a-f]{2}', content.lower())))
         
-        # Extract n-byte sequences (n hex bytes) with positions
+        # Extract n-byte sequences keyed on the raw bytes (hex formatting is
+        # only done for the patterns that are displayed)
         ngrams_with_positions = {}
-        for i in range(len(hex_bytes) - n + 1):
-            ngram = ''.join(hex_bytes[i:i+n])
+        for i in range(len(data) - n + 1):
+            ngram = data[i:i+n]
             if ngram in ngrams_with_positions:
                 ngrams_with_positions[ngram].append(i)
             else:
@@ -48,20 +51,11 @@ if len(files) > 0 and all(len(ngrams) > 0 for ngrams in all_ngrams.values()):
     
     print("\nTop common patterns found across all files:")
     for pattern, count in pattern_counts.most_common(20):
-        # Convert back to bytes for readability
-        byte_repr = ' '.join(pattern[i:i+2] for i in range(0, len(pattern), 2))
+        # Format the raw bytes for readability
+        byte_repr = pattern.hex(' ')
         
-        # Safely convert to ASCII where possible
-        ascii_repr = ''
-        for i in range(0, len(pattern), 2):
-            try:
-                byte_val = int(pattern[i:i+2], 16)
-                if 32 <= byte_val <= 126:
-                    ascii_repr += chr(byte_val)
-                else:
-                    ascii_repr += '.'
-            except ValueError:
-                ascii_repr += '?'
+        # Convert to ASCII where possible
+        ascii_repr = pattern.translate(ASCII_TABLE).decode('ascii')
         
         print(f"Pattern: {byte_repr} | ASCII: {ascii_repr} | Found in {count} files")
         
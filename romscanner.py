@@ -15,7 +15,9 @@ import struct
 import argparse
 import re
 import csv
+import mmap
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional, Union, BinaryIO
 
 # Constants based on the original code
@@ -24,6 +26,14 @@ ROM_1MB_MASK = 0xF00000
 MASK = 0xFF
 XXXX = 0x00
 
+# Little-endian UWORD, the two immediates of a "mov r12, #XXXX" /
+# "mov r13, #XXXX" instruction pair, and the four of the DPP0-DPP3 setup
+UWORD = struct.Struct("<H")
+MOV_PAIR_WORDS = struct.Struct("<2xH2xH")
+DPP_SETUP_WORDS = struct.Struct("<2xH2xH2xH2xH")
+
+ASCII_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
 # Define needle patterns from needles.c
 NEEDLE_PATTERNS = {
     # DPP Setup Needle
@@ -123,6 +133,16 @@ NEEDLE_PATTERNS = {
     },
 }
 
+# Run of printable ASCII, as taken for the KWP2000 EPK string
+PRINTABLE_RUN_PATTERN = re.compile(rb'[\x20-\x7e]*')
+
+# Typical EPK start markers ('//' or '3/'); the lookahead also reports
+# overlapping ones
+EPK_MARKER_PATTERN = re.compile(rb'(?=[/3]/)')
+
+# Names that identify a marker as the start of the EPK string
+EPK_NAME_PATTERN = re.compile(rb'ME7|F136E')
+
 # Known map definitions from table_spec.c
 KNOWN_MAPS = {
     'KFAGK': {
@@ -197,6 +217,44 @@ KNOWN_MAPS = {
     },
 }
 
+# Structure assumed for maps that are not in KNOWN_MAPS
+DEFAULT_MAP_DEF = {
+    'x_num_width': 1,  # UBYTE
+    'y_num_width': 1,  # UBYTE
+    'x_axis_width': 1, # UBYTE
+    'y_axis_width': 1, # UBYTE
+    'cell_width': 1,   # UBYTE
+    'x_axis_conv': 1.0,
+    'x_axis_desc': "",
+    'y_axis_conv': 1.0,
+    'y_axis_desc': "",
+    'cell_conv': 1.0,
+    'cell_desc': ""
+}
+
+# Map names looked for near a table to identify it, in order of preference
+MAP_SIGNATURES = {
+    'KFAGK': b'KFAGK',
+    'KFPED': b'KFPED',
+    'KFKHFM': b'KFKHFM',
+    'KFNW': b'KFNW',
+    'KFZW': b'KFZW',
+}
+
+# Matches any map signature; the lookahead also reports overlapping ones
+MAP_SIGNATURE_PATTERN = re.compile(
+    b'(?=(' + b'|'.join(re.escape(signature) for signature in MAP_SIGNATURES.values()) + b'))')
+
+@lru_cache(maxsize=None)
+def compile_needle(needle: bytes, mask: bytes) -> re.Pattern:
+    """
+    Compile a masked needle into a regex so it is matched in C.
+    Bytes whose mask is MASK must match exactly; all others match any byte.
+    Compiled needles are cached, so repeated searches reuse them.
+    """
+    return re.compile(b''.join(re.escape(bytes([byte])) if byte_mask == MASK else b'.'
+                               for byte, byte_mask in zip(needle, mask)), re.DOTALL)
+
 class ME7Scanner:
     def __init__(self, filename: str):
         self.filename = filename
@@ -208,13 +266,32 @@ class ME7Scanner:
         }
         
     def _load_file(self) -> bytes:
-        """Load the firmware file into memory."""
+        """
+        Map the firmware file read-only instead of copying it into memory.
+        The mapping stays valid after the file is closed; empty files cannot
+        be mapped, so they come back as empty bytes.
+        """
         try:
             with open(self.filename, 'rb') as f:
-                return f.read()
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         except Exception as e:
             print(f"Error loading file {self.filename}: {e}")
             sys.exit(1)
+        
+        # The scans sweep the ROM front to back, so ask for eager readahead
+        # where the platform supports it
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            data.madvise(mmap.MADV_SEQUENTIAL)
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            data.madvise(mmap.MADV_WILLNEED)
+        return data
+    
+    def close(self) -> None:
+        """Release the mapping of the firmware file."""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
     
     def search_pattern(self, needle: bytes, mask: bytes, start_offset: int = 0) -> Optional[int]:
         """
@@ -228,21 +305,31 @@ class ME7Scanner:
         Returns:
             The offset where the pattern was found or None if not found
         """
-        needle_len = len(needle)
-        
-        for i in range(start_offset, len(self.data) - needle_len):
-            match = True
-            for j in range(needle_len):
-                if mask[j] == MASK and needle[j] != self.data[i + j]:
-                    match = False
-                    break
-            if match:
-                return i
-        return None
+        # Let the regex engine scan for candidates in C rather than
+        # comparing every position byte by byte; as before, a match may
+        # not end on the last byte of the ROM
+        match = compile_needle(needle, mask).search(self.data, start_offset, self.rom_size - 1)
+        return match.start() if match else None
     
     def get_word(self, offset: int) -> int:
         """Extract a 16-bit word from ROM data."""
-        return struct.unpack("<H", self.data[offset:offset+2])[0]
+        return UWORD.unpack_from(self.data, offset)[0]
+    
+    def _read_values(self, offset: int, count: int, width: int) -> List[int]:
+        """
+        Read count consecutive values of width bytes each (UBYTE for 1, else
+        a UWORD) in one call, with 0 for values past the end of the ROM.
+        """
+        available = max(0, min(count, (self.rom_size - offset) // width))
+        if available == 0:
+            values = []
+        elif width == 1:
+            values = list(self.data[offset:offset + available])
+        elif width == 2:
+            values = list(struct.unpack_from(f"<{available}H", self.data, offset))
+        else:
+            values = [self.get_word(offset + i * width) for i in range(available)]
+        return values + [0] * (count - available)
     
     def get_dpp_values(self) -> Dict[int, int]:
         """Extract DPP register values from the ROM."""
@@ -255,8 +342,7 @@ class ME7Scanner:
             print(f"DPP setup found at offset: 0x{offset:X}")
             
             # Extract DPP values from the pattern
-            for i in range(4):
-                dpp_value = self.get_word(offset + 2 + i*4)
+            for i, dpp_value in enumerate(DPP_SETUP_WORDS.unpack_from(self.data, offset)):
                 phys_addr = dpp_value * SEGMENT_SIZE
                 self.dpp_values[i] = dpp_value
                 
@@ -277,18 +363,12 @@ class ME7Scanner:
     
     def _extract_string(self, offset: int, max_length: int = 30) -> str:
         """Extract a null-terminated string from ROM data."""
-        result = ""
-        for i in range(max_length):
-            if offset + i >= len(self.data):
-                break
-            char = self.data[offset + i]
-            if char == 0:
-                break
-            if 32 <= char <= 126:  # ASCII printable
-                result += chr(char)
-            else:
-                result += '.'
-        return result
+        chunk = self.data[offset:offset + max_length]
+        end = chunk.find(b'\x00')
+        if end != -1:
+            chunk = chunk[:end]
+        # Non-printable bytes are shown as dots
+        return chunk.translate(ASCII_TABLE).decode('ascii')
     
     def find_epk_info(self) -> Optional[str]:
         """
@@ -333,19 +413,13 @@ class ME7Scanner:
             try:
                 # Extract the string using approach from rominfo.c
                 addr = file_offset
-                if addr < len(self.data):
-                    # Skip first two bytes (length indicator)
-                    i = 2
+                if 0 <= addr < len(self.data):
+                    # Skip first two bytes (length indicator), then take the
+                    # run of printable ASCII up to the safety limit
                     max_len = 64  # Safety limit
-                    while i < max_len and addr + i < len(self.data):
-                        ch = self.data[addr + i]
-                        if ch == 0:
-                            break
-                        if 32 <= ch <= 126:  # ASCII printable
-                            epk_data += chr(ch)
-                        else:
-                            break
-                        i += 1
+                    run = PRINTABLE_RUN_PATTERN.match(
+                        self.data, addr + 2, min(addr + max_len, len(self.data)))
+                    epk_data = run.group().decode('ascii') if run else ""
                         
                     print(f"EPK: @ 0x{addr:X} {{ {epk_data} }}")
                     return epk_data
@@ -361,13 +435,17 @@ class ME7Scanner:
                 epk_region_start = 0x10000
                 epk_region_end = 0x11000
                 
-                for i in range(epk_region_start, epk_region_end):
-                    # Look for typical EPK start markers
-                    if i < len(self.data) and (self.data[i] == ord('/') or self.data[i] == ord('3')) and i+1 < len(self.data) and self.data[i+1] == ord('/'):
+                # Check each marker on the raw bytes and only decode the
+                # one that holds a known name
+                markers = EPK_MARKER_PATTERN.finditer(
+                    self.data, epk_region_start, min(epk_region_end + 1, len(self.data)))
+                for marker in markers:
+                    i = marker.start()
+                    window = self.data[i:i + 50].partition(b'\x00')[0]
+                    if len(window) > 10 and EPK_NAME_PATTERN.search(window):
                         epk_data = self._extract_string(i, 50)
-                        if len(epk_data) > 10 and ('ME7' in epk_data or 'F136E' in epk_data):
-                            print(f"EPK: @ 0x{i:X} {{ {epk_data} }}")
-                            return epk_data
+                        print(f"EPK: @ 0x{i:X} {{ {epk_data} }}")
+                        return epk_data
             
             print("EPK info pattern not found")
         
@@ -411,58 +489,74 @@ class ME7Scanner:
             'BRIF': "BRIF"
         }
         
-        # Search for common string identifiers
+        # Search for common string identifiers, encoded once up front
         common_ids = ['VMECUHN', 'SSECUHN', 'SSECUSN', 'EROTAN', 'TESTID', 'DIF', 'BRIF']
+        encoded_ids = [(id_str, id_str.encode('ascii')) for id_str in common_ids]
         found_ids = {}
+        data = self.data
         
         # Search in a range around the string table
         search_start = max(0, file_offset - 0x1000)
-        search_end = min(len(self.data), file_offset + 0x1000)
-        
-        # Find the string entries
-        idx = 1
-        for i in range(search_start, search_end, 4):
-            for id_str in common_ids:
-                id_pos = self.data.find(id_str.encode('ascii'), i, i + 200)
-                if id_pos != -1 and id_str not in found_ids:
+        search_end = min(self.rom_size, file_offset + 0x1000)
+        
+        # Search for each ID directly instead of probing a 200-byte window
+        # at every 4-byte step. An occurrence is reached at the first step
+        # whose window holds it and no earlier occurrence, so entries are
+        # still reported in the order the stepped scan found them.
+        entries = []
+        for order, (id_str, id_bytes) in enumerate(encoded_ids):
+            previous = search_start - 1
+            id_pos = data.find(id_bytes, search_start)
+            while id_pos != -1:
+                first = max(previous + 1, id_pos + len(id_bytes) - 200, search_start)
+                step = search_start + (first - search_start + 3) // 4 * 4
+                if step >= search_end:
+                    break
+                if step <= id_pos:
                     # Look for string data before the ID
                     string_pos = id_pos - 50
                     if string_pos > 0:
                         # Find a null-terminated string before the ID
-                        for j in range(string_pos, id_pos):
-                            if self.data[j] == 0:
-                                string_start = j + 1
-                                string_value = self._extract_string(string_start, 30)
-                                if string_value and len(string_value) > 3:
-                                    string_value = string_value.ljust(22)
-                                    addr_hex = 0x10000 + (string_start % 0x10000)
-                                    print(f"Idx={idx}   {{ {string_value} }} 0x{addr_hex:X} : {id_str} [{id_meanings.get(id_str, '')}]")
-                                    found_ids[id_str] = string_value
-                                    idx += 1
+                        j = data.find(b'\x00', string_pos, id_pos)
+                        if j != -1:
+                            string_start = j + 1
+                            string_value = self._extract_string(string_start, 30)
+                            if string_value and len(string_value) > 3:
+                                entries.append((step, order, id_str, string_start, string_value))
                                 break
+                previous = id_pos
+                id_pos = data.find(id_bytes, id_pos + 1)
+        
+        # Find the string entries
+        for idx, (_, _, id_str, string_start, string_value) in enumerate(sorted(entries), 1):
+            string_value = string_value.ljust(22)
+            addr_hex = 0x10000 + (string_start % 0x10000)
+            print(f"Idx={idx}   {{ {string_value} }} 0x{addr_hex:X} : {id_str} [{id_meanings.get(id_str, '')}]")
+            found_ids[id_str] = string_value
         
         return found_ids
     
     def find_maps(self) -> List[Dict]:
         """Find map tables in the ROM and extract their structure."""
         maps = []
-        offset = 0
         
         print("\nScanning for map tables...")
         
-        while True:
-            offset = self.search_pattern(
-                NEEDLE_PATTERNS['map_table']['needle'],
-                NEEDLE_PATTERNS['map_table']['mask'],
-                offset
-            )
-            
-            if offset is None or offset >= len(self.data) - 20:
+        # Find every non-overlapping needle in one regex pass; as with
+        # search_pattern, a match may not end on the last byte of the ROM
+        needle = compile_needle(
+            NEEDLE_PATTERNS['map_table']['needle'],
+            NEEDLE_PATTERNS['map_table']['mask']
+        )
+        
+        for match in needle.finditer(self.data, 0, len(self.data) - 1):
+            offset = match.start()
+            if offset >= len(self.data) - 20:
                 break
                 
-            # Extract map information
-            map_offset = self.get_word(offset + 2)  # Offset in the "mov r12, #XXXX" instruction
-            seg_value = self.get_word(offset + 6)   # Segment value in the "mov r13, #XXXX" instruction
+            # Extract map information: the offset in the "mov r12, #XXXX"
+            # instruction and the segment value in the "mov r13, #XXXX" one
+            map_offset, seg_value = MOV_PAIR_WORDS.unpack_from(self.data, offset)
             
             # Calculate physical address
             phys_addr = (seg_value * SEGMENT_SIZE) + map_offset
@@ -486,9 +580,6 @@ class ME7Scanner:
             x_size = map_data.get('x_size', '?')
             y_size = map_data.get('y_size', '?')
             print(f"Map found: '{map_name}' at 0x{file_offset:X} (phys: 0x{phys_addr:X}), size: {x_size}x{y_size}")
-            
-            # Continue searching from after this match
-            offset += len(NEEDLE_PATTERNS['map_table']['needle'])
         
         print(f"Total maps found: {len(maps)}")
         return maps
@@ -509,20 +600,7 @@ class ME7Scanner:
         map_type = self.identify_map_type(offset)
         
         # Get map definition or use defaults
-        map_def = KNOWN_MAPS.get(map_type, {
-            'desc': f"Unknown Map at 0x{offset:X}",
-            'x_num_width': 1,  # UBYTE
-            'y_num_width': 1,  # UBYTE
-            'x_axis_width': 1, # UBYTE
-            'y_axis_width': 1, # UBYTE
-            'cell_width': 1,   # UBYTE
-            'x_axis_conv': 1.0,
-            'x_axis_desc': "",
-            'y_axis_conv': 1.0,
-            'y_axis_desc': "",
-            'cell_conv': 1.0,
-            'cell_desc': ""
-        })
+        map_def = KNOWN_MAPS.get(map_type, DEFAULT_MAP_DEF)
         
         # Extract map dimensions and structure
         try:
@@ -533,7 +611,7 @@ class ME7Scanner:
             cell_width = map_def['cell_width']
             
             # Read map dimensions
-            if offset + x_num_width > len(self.data):
+            if offset + x_num_width > self.rom_size:
                 return {'name': map_type, 'error': "Offset out of range"}
             
             if x_num_width == 1:
@@ -543,7 +621,7 @@ class ME7Scanner:
                 
             if y_num_width == 0:  # 1D map (no Y dimension)
                 y_size = 0
-            elif offset + x_num_width + y_num_width <= len(self.data):
+            elif offset + x_num_width + y_num_width <= self.rom_size:
                 if y_num_width == 1:
                     y_size = self.data[offset + x_num_width]
                 else:  # Assume 2 bytes (UWORD)
@@ -563,82 +641,39 @@ class ME7Scanner:
                 
             # Read X axis data
             x_axis_start = offset + x_num_width + y_num_width
-            x_axis_data = []
-            
-            for i in range(x_size):
-                if x_axis_start + i * x_axis_width + x_axis_width <= len(self.data):
-                    if x_axis_width == 1:
-                        value = self.data[x_axis_start + i]
-                    else:  # Assume 2 bytes (UWORD)
-                        value = self.get_word(x_axis_start + i * x_axis_width)
-                    x_axis_data.append(value)
-                else:
-                    x_axis_data.append(0)  # Out of range
+            x_axis_data = self._read_values(x_axis_start, x_size, x_axis_width)
             
             # Read Y axis data (if applicable)
             y_axis_data = []
             
             if y_size > 0:
                 y_axis_start = x_axis_start + (x_size * x_axis_width)
-                
-                for i in range(y_size):
-                    if y_axis_start + i * y_axis_width + y_axis_width <= len(self.data):
-                        if y_axis_width == 1:
-                            value = self.data[y_axis_start + i]
-                        else:  # Assume 2 bytes (UWORD)
-                            value = self.get_word(y_axis_start + i * y_axis_width)
-                        y_axis_data.append(value)
-                    else:
-                        y_axis_data.append(0)  # Out of range
+                y_axis_data = self._read_values(y_axis_start, y_size, y_axis_width)
             
             # Read cell data
-            cell_data = []
-            
             if y_size > 0:
                 cell_start = y_axis_start + (y_size * y_axis_width)
                 
-                # 2D map: create a 2D array of cells
-                for y in range(y_size):
-                    row = []
-                    for x in range(x_size):
-                        cell_offset = cell_start + ((y * x_size) + x) * cell_width
-                        if cell_offset + cell_width <= len(self.data):
-                            if cell_width == 1:
-                                value = self.data[cell_offset]
-                            else:  # Assume 2 bytes (UWORD)
-                                value = self.get_word(cell_offset)
-                        else:
-                            value = 0  # Out of range
-                        row.append(value)
-                    cell_data.append(row)
+                # 2D map: read all cells at once and split them into rows
+                cells = self._read_values(cell_start, x_size * y_size, cell_width)
+                cell_data = [cells[y * x_size:(y + 1) * x_size] for y in range(y_size)]
             else:
                 # 1D map: create a single row
                 cell_start = x_axis_start + (x_size * x_axis_width)
-                row = []
-                
-                for x in range(x_size):
-                    cell_offset = cell_start + x * cell_width
-                    if cell_offset + cell_width <= len(self.data):
-                        if cell_width == 1:
-                            value = self.data[cell_offset]
-                        else:  # Assume 2 bytes (UWORD)
-                            value = self.get_word(cell_offset)
-                    else:
-                        value = 0  # Out of range
-                    row.append(value)
-                cell_data.append(row)
+                cell_data = [self._read_values(cell_start, x_size, cell_width)]
             
             # Convert to human-readable values
-            x_axis_data_conv = [val / map_def.get('x_axis_conv', 1.0) for val in x_axis_data]
-            y_axis_data_conv = [val / map_def.get('y_axis_conv', 1.0) for val in y_axis_data] if y_axis_data else []
+            x_axis_conv = map_def.get('x_axis_conv', 1.0)
+            y_axis_conv = map_def.get('y_axis_conv', 1.0)
+            cell_conv = map_def.get('cell_conv', 1.0)
             
-            cell_data_conv = []
-            for row in cell_data:
-                cell_data_conv.append([val / map_def.get('cell_conv', 1.0) for val in row])
+            x_axis_data_conv = [val / x_axis_conv for val in x_axis_data]
+            y_axis_data_conv = [val / y_axis_conv for val in y_axis_data] if y_axis_data else []
+            cell_data_conv = [[val / cell_conv for val in row] for row in cell_data]
             
             return {
                 'name': map_type,
-                'description': map_def.get('desc', ''),
+                'description': map_def.get('desc', f"Unknown Map at 0x{offset:X}"),
                 'x_size': x_size,
                 'y_size': y_size,
                 'x_axis_data': x_axis_data,
@@ -652,11 +687,11 @@ class ME7Scanner:
                 'x_axis_width': x_axis_width,
                 'y_axis_width': y_axis_width,
                 'cell_width': cell_width,
-                'x_axis_conv': map_def.get('x_axis_conv', 1.0),
+                'x_axis_conv': x_axis_conv,
                 'x_axis_desc': map_def.get('x_axis_desc', ''),
-                'y_axis_conv': map_def.get('y_axis_conv', 1.0),
+                'y_axis_conv': y_axis_conv,
                 'y_axis_desc': map_def.get('y_axis_desc', ''),
-                'cell_conv': map_def.get('cell_conv', 1.0),
+                'cell_conv': cell_conv,
                 'cell_desc': map_def.get('cell_desc', '')
             }
             
@@ -683,21 +718,17 @@ class ME7Scanner:
         # For demonstration, just use a basic signature approach
         
         # This is just a placeholder - actual implementation would need more ROM-specific logic
-        signatures = {
-            'KFAGK': b'KFAGK',
-            'KFPED': b'KFPED',
-            'KFKHFM': b'KFKHFM',
-            'KFNW': b'KFNW',
-            'KFZW': b'KFZW',
-        }
         
-        # Check for signatures within a reasonable range
+        # Check for signatures within a reasonable range, collecting every
+        # signature present in one pass over the window
         search_range = 256  # bytes
         start = max(0, offset - search_range)
-        end = min(len(self.data), offset + search_range)
+        end = min(self.rom_size, offset + search_range)
+        found = {match.group(1) for match in MAP_SIGNATURE_PATTERN.finditer(self.data, start, end)}
         
-        for map_type, signature in signatures.items():
-            if self.data.find(signature, start, end) != -1:
+        # The first signature in table order wins, as before
+        for map_type, signature in MAP_SIGNATURES.items():
+            if signature in found:
                 return map_type
         
         return map_name
@@ -734,43 +765,21 @@ class ME7Scanner:
         
         # Display header with X-axis values
         print("\nX-axis values:")
-        print("    ", end="")
-        for x in range(min(10, map_data['x_size'])):  # Limit to first 10 columns for readability
-            if human_readable:
-                print(f"{x_axis_values[x]:8.2f}", end="")
-            else:
-                print(f"{x_axis_values[x]:8d}", end="")
-                
-        if map_data['x_size'] > 10:
-            print(" ...")
-        else:
-            print()
+        cell_fmt = '{:8.2f}'.format if human_readable else '{:8d}'.format
+        columns = min(10, map_data['x_size'])  # Limit to first 10 columns for readability
+        more = " ..." if map_data['x_size'] > 10 else ""
+        print("    " + "".join(map(cell_fmt, x_axis_values[:columns])) + more)
         
         # Display Y-axis and cell data
         print("\nMap data (Y-axis, cells):")
         y_range = min(20, map_data['y_size']) if map_data['y_size'] > 0 else 1
         
+        y_fmt = '{:4.1f} |'.format if human_readable else '{:4d} |'.format
+        
         for y in range(y_range):
-            # Display Y-axis value if available
-            if map_data['y_size'] > 0:
-                if human_readable:
-                    print(f"{y_axis_values[y]:4.1f} |", end="")
-                else:
-                    print(f"{y_axis_values[y]:4d} |", end="")
-            else:
-                print("     |", end="")
-            
-            # Display cell values
-            for x in range(min(10, map_data['x_size'])):
-                if human_readable:
-                    print(f"{cell_values[y][x]:8.2f}", end="")
-                else:
-                    print(f"{cell_values[y][x]:8d}", end="")
-            
-            if map_data['x_size'] > 10:
-                print(" ...")
-            else:
-                print()
+            # Display Y-axis value if available, then the cell values
+            label = y_fmt(y_axis_values[y]) if map_data['y_size'] > 0 else "     |"
+            print(label + "".join(map(cell_fmt, cell_values[y][:columns])) + more)
         
         if map_data['y_size'] > 20:
             print("...")
@@ -810,36 +819,25 @@ class ME7Scanner:
                         f"Cell unit: {map_data.get('cell_desc', '')}"
                     ])
                 
-                # Write X-axis header
-                header_row = ["Y/X"]
-                for x_val in x_axis_values:
-                    if human_readable:
-                        header_row.append(f"{x_val:.2f}")
-                    else:
-                        header_row.append(str(x_val))
-                writer.writerow(header_row)
+                # Write X-axis header and the Y-axis/cell rows in one call
+                fmt = '{:.2f}'.format if human_readable else str
+                rows = [["Y/X"] + [fmt(x_val) for x_val in x_axis_values]]
                 
-                # Write Y-axis and cell data
                 y_range = map_data['y_size'] if map_data['y_size'] > 0 else 1
+                x_size = map_data['x_size']
                 
                 for y in range(y_range):
                     # Start with Y-axis value if available
                     if map_data['y_size'] > 0:
-                        if human_readable:
-                            row = [f"{y_axis_values[y]:.2f}"]
-                        else:
-                            row = [str(y_axis_values[y])]
+                        row = [fmt(y_axis_values[y])]
                     else:
                         row = [""]
                     
                     # Add cell values
-                    for x in range(map_data['x_size']):
-                        if human_readable:
-                            row.append(f"{cell_values[y][x]:.2f}")
-                        else:
-                            row.append(str(cell_values[y][x]))
-                    
-                    writer.writerow(row)
+                    row.extend(map(fmt, cell_values[y][:x_size]))
+                    rows.append(row)
+                
+                writer.writerows(rows)
             
             return True
         except Exception as e:
@@ -977,6 +975,8 @@ def main():
             filename = os.path.join(args.export_maps, f"{safe_name}.csv")
             if scanner.export_map_to_csv(map_data, filename, not args.raw):
                 print(f"Exported {map_name} to {filename}")
+    
+    scanner.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file